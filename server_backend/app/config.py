@@ -10,12 +10,15 @@ class Settings(BaseSettings):
     MINIO_DEFAULT_BUCKET: str = "raw-data"
     MINIO_USE_HTTPS: bool = False
 
-    # PostgreSQL Settings
-    PG_HOST: str = "postgres-metadata-db"
+    # PostgreSQL Settings (connections go through PgBouncer in transaction-pooling mode)
+    PG_HOST: str = "pgbouncer"
     PG_DATABASE: str
     PG_USER: str
     PG_PASSWORD: str
-    PG_PORT: int = 5432
+    PG_PORT: int = 6432
+    PG_POOL_MIN_SIZE: int = 2
+    PG_POOL_MAX_SIZE: int = 20
+    PG_CONNECT_TIMEOUT: float = 5.0
 
     model_config = SettingsConfigDict(env_file="../.env", env_file_encoding="utf-8")
 
@@ -1,8 +1,10 @@
+import asyncio
+import contextlib
 import datetime
 import logging
 import uuid
 
-import psycopg2  # library for PostgreSQL database connection
+import asyncpg  # asyncio-native PostgreSQL driver
 
 from config import settings
 
@@ -14,6 +16,57 @@ PG_DATABASE = settings.PG_DATABASE
 PG_USER = settings.PG_USER
 PG_PASSWORD = settings.PG_PASSWORD
 PG_PORT = settings.PG_PORT
+PG_POOL_MIN_SIZE = settings.PG_POOL_MIN_SIZE
+PG_POOL_MAX_SIZE = settings.PG_POOL_MAX_SIZE
+PG_CONNECT_TIMEOUT = settings.PG_CONNECT_TIMEOUT
+
+# Errors raised when a pooled connection cannot be opened or is lost mid-query
+CONNECTION_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+)
+
+# Shared connection pool, created once per process by init_pg_pool()
+_pg_pool: asyncpg.Pool | None = None
+_pg_pool_lock = asyncio.Lock()
+
+
+# SQL insert statement for file metadata, shared by the single and batch inserts.
+# upload_timestamp defaults to the database clock when no value is passed.
+INSERT_METADATA_QUERY = """
+INSERT INTO file_index.files_metadata_catalog (
+    file_id, project_id, file_name, file_type, content_type,
+    experiment_type, author, date_conducted, size_bytes,
+    minio_bucket_name, minio_object_path, upload_timestamp, custom_tags
+) VALUES (
+    $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, COALESCE($12, now()), $13
+)
+"""
+
+
+# Fixed-shape search query: every filter is always bound and skipped when NULL,
+# so all searches share one SQL text instead of one per combination of filters.
+# Statements are unnamed (see statement_cache_size), so each execution is planned
+# with the actual parameter values: the NULL checks fold away and the indexes
+# on the remaining filters stay usable.
+SEARCH_FILES_QUERY = """
+SELECT file_id, project_id, file_name, file_type, content_type,
+       experiment_type, author, date_conducted, size_bytes,
+       minio_bucket_name, minio_object_path, upload_timestamp, custom_tags
+FROM file_index.files_metadata_catalog
+WHERE ($1::uuid IS NULL OR file_id = $1)
+  AND ($2::text IS NULL OR project_id ILIKE $2)
+  AND ($3::text IS NULL OR author ILIKE $3)
+  AND ($4::text IS NULL OR file_type ILIKE $4)
+  AND ($5::text IS NULL OR experiment_type ILIKE $5)
+  AND ($6::date IS NULL OR date_conducted >= $6)
+  AND ($7::date IS NULL OR date_conducted <= $7)
+  AND ($8::text IS NULL OR custom_tags_tsv @@ plainto_tsquery('simple', $8))
+ORDER BY upload_timestamp DESC
+LIMIT 100;
+"""
 
 
 class DatabaseConnectionError(Exception):
@@ -22,30 +75,77 @@ class DatabaseConnectionError(Exception):
     pass
 
 
-def get_pg_connection():
+async def init_pg_pool() -> asyncpg.Pool:
     """
-    Establish and return a connection to the PostgreSQL database.
+    Create the PostgreSQL connection pool if it does not exist yet and return it.
     Raises DatabaseConnectionError if configuration is missing or connection fails.
     """
-    # Check if all required environment variables are set
-    if not all([PG_HOST, PG_DATABASE, PG_USER, PG_PASSWORD]):
-        logger.error(
-            "PostgreSQL connection details (PG_HOST, PG_DATABASE, PG_USER, PG_PASSWORD) are not fully configured in db environment."
-        )
-        raise DatabaseConnectionError(
-            "Configuration details not set for PostgreSQL connection."
-        )
+    global _pg_pool
+
+    async with _pg_pool_lock:
+        if _pg_pool is not None:
+            return _pg_pool
+
+        # Check if all required environment variables are set
+        if not all([PG_HOST, PG_DATABASE, PG_USER, PG_PASSWORD]):
+            logger.error(
+                "PostgreSQL connection details (PG_HOST, PG_DATABASE, PG_USER, PG_PASSWORD) are not fully configured in db environment."
+            )
+            raise DatabaseConnectionError(
+                "Configuration details not set for PostgreSQL connection."
+            )
+        try:
+            _pg_pool = await asyncpg.create_pool(
+                host=PG_HOST,
+                port=PG_PORT,
+                user=PG_USER,
+                password=PG_PASSWORD,
+                database=PG_DATABASE,
+                min_size=PG_POOL_MIN_SIZE,
+                max_size=PG_POOL_MAX_SIZE,
+                # Fail fast when PostgreSQL is down, so requests waiting on the
+                # lock are not held for the driver's default 60 s each
+                timeout=PG_CONNECT_TIMEOUT,
+                # PgBouncer in transaction mode does not keep a client on the same
+                # server connection, so named prepared statements cannot be cached
+                statement_cache_size=0,
+            )
+            logger.info("PostgreSQL connection pool created.")
+            return _pg_pool
+        except (asyncpg.PostgresError, OSError) as e:
+            logger.error(f"Failed to connect to PostgreSQL: {e}", exc_info=True)
+            raise DatabaseConnectionError(f"Failed to connect to database: {e}")
+        except Exception as e:
+            logger.error(f"Failed to connect to PostgreSQL: {e}", exc_info=True)
+            raise DatabaseConnectionError(
+                f"Unexpected error connecting to database: {e}"
+            )
+
+
+async def close_pg_pool():
+    """Close the PostgreSQL connection pool, if one was created."""
+    global _pg_pool
+
+    if _pg_pool is not None:
+        await _pg_pool.close()
+        _pg_pool = None
+        logger.info("PostgreSQL connection pool closed.")
+
+
+@contextlib.asynccontextmanager
+async def acquire():
+    """
+    Check a connection out of the pool for the duration of the `async with` block.
+    The pool is created lazily if it was not available at application startup.
+    Raises DatabaseConnectionError if a connection cannot be opened or is lost.
+    """
+    pool = _pg_pool or await init_pg_pool()
     try:
-        # Build connection string for psycopg2
-        conn_string = f"host='{PG_HOST}' port='{PG_PORT}' dbname='{PG_DATABASE}' user='{PG_USER}' password='{PG_PASSWORD}'"
-        conn = psycopg2.connect(conn_string)
-        return conn
-    except psycopg2.Error as e:
-        logger.error(f"Failed to connect to PostGreSQL: {e}", exc_info=True)
-        raise DatabaseConnectionError(f"Failed to connect to database: {e}")
-    except Exception as e:
-        logger.error(f"Failed to connect to PostgreSQL: {e}", exc_info=True)
-        raise DatabaseConnectionError(f"Unexpected error connecting to database: {e}")
+        async with pool.acquire() as conn:
+            yield conn
+    except CONNECTION_ERRORS as e:
+        logger.error(f"Lost connection to PostgreSQL: {e}", exc_info=True)
+        raise DatabaseConnectionError(f"Database connection failed: {e}") from e
 
 
 async def store_file_metadata_in_db(
@@ -56,7 +156,7 @@ async def store_file_metadata_in_db(
     size_bytes: int,
     minio_bucket_name: str,
     minio_object_path: str,
-    upload_timestamp: datetime.datetime,
+    upload_timestamp: datetime.datetime | None = None,
     project_id: str = None,
     experiment_type: str = None,
     author: str = None,
@@ -74,7 +174,7 @@ async def store_file_metadata_in_db(
         size_bytes: Size of the file in bytes.
         minio_bucket_name: Name of the MinIO bucket where the file is stored.
         minio_object_path: Path to the object in MinIO.
-        upload_timestamp: Timestamp when the file was uploaded.
+        upload_timestamp: (Optional) Timestamp when the file was uploaded; defaults to now() in PostgreSQL.
         project_id: (Optional) Associated project ID.
         experiment_type: (Optional) Type of experiment.
         author: (Optional) Author of the experiment.
@@ -86,45 +186,24 @@ async def store_file_metadata_in_db(
     """
     logger.info("Attempting to store file metadata in PostgreSQL database.")
 
-    conn = None
-
-    # Prepare data for insertion into the database
-    data_to_insert = {
-        "file_id": str(file_id),  # This is already a UUID object
-        "project_id": project_id,
-        "file_name": original_file_name,
-        "file_type": file_type_extension,
-        "content_type": content_type,
-        "experiment_type": experiment_type,
-        "author": author,
-        "date_conducted": date_conducted,
-        "size_bytes": size_bytes,
-        "minio_bucket_name": minio_bucket_name,
-        "minio_object_path": minio_object_path,
-        "upload_timestamp": upload_timestamp,
-        "custom_tags": custom_tags,
-    }
-
     try:
-        conn = get_pg_connection()
-
-        with conn.cursor() as cursor:
-            # SQL insert statement for file metadata
-            insert_query = """
-            INSERT INTO file_index.files_metadata_catalog (
-                file_id, project_id, file_name, file_type, content_type,
-                experiment_type, author, date_conducted, size_bytes,
-                minio_bucket_name, minio_object_path, upload_timestamp, custom_tags
-            ) VALUES (
-                %(file_id)s, %(project_id)s, %(file_name)s, %(file_type)s,
-                %(content_type)s, %(experiment_type)s, %(author)s,
-                %(date_conducted)s, %(size_bytes)s,
-                %(minio_bucket_name)s, %(minio_object_path)s,
-                %(upload_timestamp)s, %(custom_tags)s
+        async with acquire() as conn:
+            await conn.execute(
+                INSERT_METADATA_QUERY,
+                file_id,
+                project_id,
+                original_file_name,
+                file_type_extension,
+                content_type,
+                experiment_type,
+                author,
+                date_conducted,
+                size_bytes,
+                minio_bucket_name,
+                minio_object_path,
+                upload_timestamp,
+                custom_tags,
             )
-            """
-            cursor.execute(insert_query, data_to_insert)
-            conn.commit()
         logger.info("File metadata successfully stored in PostgreSQL database.")
         return {
             "status": "success",
@@ -146,11 +225,9 @@ async def store_file_metadata_in_db(
             "status": "error",
             "message": f"Database Connection Error: {str(conn_err)}",
         }
-    except (
-        psycopg2.Error
-    ) as db_op_err:  # Catch errors during DB operations (insert, commit)
-        if conn:
-            conn.rollback()  # Rollback transaction on error
+    except asyncpg.PostgresError as db_op_err:  # Catch errors during the INSERT
+        # A single-statement execute runs in its own implicit transaction,
+        # so a failed INSERT is rolled back by PostgreSQL itself.
         logger.error(
             f"PostgreSQL operational error storing metadata for {original_file_name}: {db_op_err}",
             exc_info=True,
@@ -160,16 +237,84 @@ async def store_file_metadata_in_db(
             "message": f"Database operational error: {str(db_op_err)}",
         }
     except Exception as e:  # Catch any other unexpected errors
-        if conn:
-            conn.rollback()
         logger.error(
             f"Unexpected error storing metadata for {original_file_name}: {e}",
             exc_info=True,
         )
         return {"status": "error", "message": f"Failed to store metadata: {str(e)}"}
-    finally:
-        if conn:
-            conn.close()  # Ensure the connection is closed
+
+
+def _metadata_row(metadata: dict) -> tuple:
+    """
+    Order a dict of store_file_metadata_in_db keyword arguments as the
+    positional parameters of INSERT_METADATA_QUERY.
+    """
+    return (
+        metadata["file_id"],
+        metadata.get("project_id"),
+        metadata["original_file_name"],
+        metadata["file_type_extension"],
+        metadata["content_type"],
+        metadata.get("experiment_type"),
+        metadata.get("author"),
+        metadata.get("date_conducted"),
+        metadata["size_bytes"],
+        metadata["minio_bucket_name"],
+        metadata["minio_object_path"],
+        metadata.get("upload_timestamp"),
+        metadata.get("custom_tags"),
+    )
+
+
+async def store_file_metadata_batch(records: list[dict]) -> dict:
+    """
+    Store metadata for many files in one round trip to PostgreSQL.
+
+    Args:
+        records: One dict per file, keyed like the arguments of store_file_metadata_in_db.
+
+    Returns:
+        dict: Status and message about the operation. The batch is atomic, so
+        either every record is stored or none are.
+    """
+    if not records:
+        return {"status": "success", "message": "No metadata to store."}
+
+    logger.info(
+        f"Attempting to store metadata for {len(records)} files in PostgreSQL database."
+    )
+
+    try:
+        async with acquire() as conn:
+            # executemany pipelines all rows and runs them in a single transaction
+            await conn.executemany(
+                INSERT_METADATA_QUERY, [_metadata_row(record) for record in records]
+            )
+        logger.info(
+            f"Metadata for {len(records)} files successfully stored in PostgreSQL database."
+        )
+        return {"status": "success", "message": "Metadata stored successfully."}
+    except DatabaseConnectionError as conn_err:
+        logger.error(
+            f"Cannot store metadata batch due to database connection issue: {conn_err}",
+            exc_info=False,
+        )
+        return {
+            "status": "error",
+            "message": f"Database Connection Error: {str(conn_err)}",
+        }
+    except asyncpg.PostgresError as db_op_err:
+        logger.error(
+            f"PostgreSQL operational error storing metadata batch: {db_op_err}",
+            exc_info=True,
+        )
+        return {
+            "status": "error",
+            "message": f"Database operational error: {str(db_op_err)}",
+        }
+    except Exception as e:
+        logger.error(f"Unexpected error storing metadata batch: {e}", exc_info=True)
+        return {"status": "error", "message": f"Failed to store metadata: {str(e)}"}
 
 
 async def search_files_in_db(
@@ -190,7 +335,7 @@ async def search_files_in_db(
         author: Filter by author name (case-insensitive).
         file_type: Filter by file extension (e.g., 'MATLAB', 'PDF'), case-insensitive.
         experiment_type: Filter by experiment type (case-insensitive).
-        tags_contain: Search for a keyword within the comma-separated custom_tags field.
+        tags_contain: Search for whole keywords within the comma-separated custom_tags field.
         date_before: Filter files conducted before this date.
         date_after: Filter files conducted after this date.
         file_id: * Not meant as serach criteria, only for proper handling in MATLAB client library
@@ -200,85 +345,34 @@ async def search_files_in_db(
     """
 
     logger.info("Searching for files in PostgreSQL database with provided filters.")
-    conn = None
-    results = []
 
     try:
-        conn = get_pg_connection()
-        with conn.cursor() as cursor:
-            base_query = """
-            SELECT file_id, project_id, file_name, file_type, content_type,
-                   experiment_type, author, date_conducted, size_bytes,
-                   minio_bucket_name, minio_object_path, upload_timestamp, custom_tags
-            FROM file_index.files_metadata_catalog
-            """
-            where_clauses = []
-            query_params = {}
-
-            # Add conditions only for parameters that are actually provided by the client
-            if file_id:
-                where_clauses.append("file_id = %(file_id)s")
-                query_params["file_id"] = str(file_id)
-
-            if project_id:
-                # Use ILIKE for case-insensitive matching for text fields
-                where_clauses.append("project_id ILIKE %(project_id)s")
-                query_params["project_id"] = (
-                    f"%{project_id}%"  # Add wildcards for partial match
-                )
-
-            if author:
-                where_clauses.append("author ILIKE %(author)s")
-                query_params["author"] = f"%{author}%"
-
-            if file_type:
-                where_clauses.append("file_type ILIKE %(file_type)s")
-                query_params["file_type"] = f"%{file_type}%"
-
-            if experiment_type:
-                where_clauses.append("experiment_type ILIKE %(experiment_type)s")
-                query_params["experiment_type"] = f"%{experiment_type}%"
-
-            if date_after:
-                where_clauses.append("date_conducted >= %(date_after)s")
-                query_params["date_after"] = date_after
-
-            if date_before:
-                where_clauses.append("date_conducted <= %(date_before)s")
-                query_params["date_before"] = date_before
-
-            if tags_contain:
-                where_clauses.append("custom_tags ILIKE %(tags_contain)s")
-                query_params["tags_contain"] = f"%{tags_contain}%"
-
-            if where_clauses:
-                final_query = f"{base_query} WHERE {' AND '.join(where_clauses)}"
-            else:
-                final_query = base_query
-
-            final_query += " ORDER BY upload_timestamp DESC LIMIT 100;"
-
-            logger.info(
-                f"Executing search query: {final_query} with params: {query_params}"
-            )
-
-            cursor.execute(final_query, query_params)
-
-            column_names = [desc[0] for desc in cursor.description]  # Get column names
-
-            # Fetch all results and convert to list of dictionaries
-            for row in cursor.fetchall():
-                results.append(dict(zip(column_names, row)))
-
-        return results
-
-    except (DatabaseConnectionError, psycopg2.Error) as e:
+        async with acquire() as conn:
+            # Unused filters are bound as NULL, which disables their condition.
+            # Use ILIKE for case-insensitive matching for text fields,
+            # with wildcards for partial match.
+            query_params = [
+                file_id or None,
+                f"%{project_id}%" if project_id else None,
+                f"%{author}%" if author else None,
+                f"%{file_type}%" if file_type else None,
+                f"%{experiment_type}%" if experiment_type else None,
+                date_after or None,
+                date_before or None,
+                tags_contain or None,
+            ]
+
+            logger.info(f"Executing search query with params: {query_params}")
+
+            rows = await conn.fetch(SEARCH_FILES_QUERY, *query_params)
+
+        # asyncpg Records are already keyed by column name
+        return [dict(record) for record in rows]
+
+    except (DatabaseConnectionError, asyncpg.PostgresError) as e:
         logger.error(f"Database error during metadata search: {e}", exc_info=True)
         # Re-raise the exception to be handled by the API endpoint layer
         raise e
-    finally:
-        if conn:
-            conn.close()
 
 
 async def get_file_minio_details(file_id: uuid.UUID) -> dict | None:
@@ -287,29 +381,21 @@ async def get_file_minio_details(file_id: uuid.UUID) -> dict | None:
     """
     logger.info(f"Retrieving MinIO details for file ID: {file_id}")
 
-    conn = None
     try:
-        conn = get_pg_connection()
-        with conn.cursor() as cursor:
+        async with acquire() as conn:
             # SQL query to fetch MinIO details for the given file_id
             sql_query = """
             SELECT minio_bucket_name, minio_object_path, file_name, content_type
             FROM file_index.files_metadata_catalog
-            WHERE file_id = %s;
+            WHERE file_id = $1;
             """
-            params_to_execute = (str(file_id),)
-
-            cursor.execute(
-                sql_query,
-                params_to_execute,
-            )
-            result = cursor.fetchone()
+            result = await conn.fetchrow(sql_query, file_id)
             # If a result is found, unpack it into a dictionary and return it
             if result:
-                bucket_name = result[0]
-                object_path = result[1]
-                filename = result[2]
-                content_type = result[3]
+                bucket_name = result["minio_bucket_name"]
+                object_path = result["minio_object_path"]
+                filename = result["file_name"]
+                content_type = result["content_type"]
                 logger.info(
                     f"Found MinIO path for file_id {file_id}: {bucket_name}/{object_path}"
                 )
@@ -322,9 +408,6 @@ async def get_file_minio_details(file_id: uuid.UUID) -> dict | None:
             else:
                 logger.info(f"No MinIO details found for file ID: {file_id}")
                 return None
-    except (DatabaseConnectionError, psycopg2.Error) as e:
+    except (DatabaseConnectionError, asyncpg.PostgresError) as e:
         logger.error(f"Database error retrieving MinIO details: {e}", exc_info=True)
         raise e
-    finally:
-        if conn:
-            conn.close()
@@ -1,8 +1,8 @@
+import asyncio
 import datetime
 import logging
 import os
-import shutil
-import tempfile
+import re
 import uuid
 import zipfile
 from pathlib import Path
@@ -16,13 +16,22 @@ from starlette.background import BackgroundTask
 from config import settings
 from db import (
     DatabaseConnectionError,
+    close_pg_pool,
     get_file_minio_details,
+    init_pg_pool,
     search_files_in_db,
+    store_file_metadata_batch,
     store_file_metadata_in_db,
 )
 from minio_client import get_minio_client
 from utils import get_file_extension, sanitize_filename, sanitize_project_id
 
+# Prefer the LibYAML-backed C parser; fall back to pure Python if it is unavailable
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 # Configure logging for this module
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,6 +43,21 @@ MINIO_SECRET_KEY = settings.MINIO_SECRET_KEY
 MINIO_DEFAULT_BUCKET = settings.MINIO_DEFAULT_BUCKET
 MINIO_USE_HTTPS = settings.MINIO_USE_HTTPS
 
+# Maximum number of ZIP members uploaded to MinIO at the same time
+FOLDER_UPLOAD_CONCURRENCY = 16
+
+# Size of each chunk read from MinIO and written to the client during downloads
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Multipart part size for MinIO uploads
+MINIO_PART_SIZE = 10 * 1024 * 1024
+
+# Content type stored and served when the client did not provide one
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+# Zero-padded YYYY-MM-DD dates, which date.fromisoformat parses like strptime
+ISO_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
 # Initialize FastAPI app
 app = FastAPI(title="API Data Service")
 
@@ -47,105 +71,165 @@ minio_client = get_minio_client(
 )
 
 
-async def process_and_store_file(
-    file_data,
-    original_filename: str,
-    content_type: str,
-    file_size: int,
-    user_metadata: dict,
-    minio_folder_prefix: str = "",  # Add a prefix for folder uploads
-) -> dict:
-    """
-    Helper function to process a single file, upload it to MinIO, and store its metadata.
-    This logic is shared between single file and folder uploads.
-    """
-    # Fetch metadata from dictionary
-    project_id = user_metadata.get("project_id", "")
-    author = user_metadata.get("author")
-    experiment_type = user_metadata.get("experiment_type")
-    date_conducted_str = user_metadata.get("date_conducted")
-    custom_tags = user_metadata.get("custom_tags")
+@app.on_event("startup")
+async def open_database_pool():
+    """Create the PostgreSQL connection pool once per worker process."""
+    try:
+        await init_pg_pool()
+    except DatabaseConnectionError as e:
+        # Keep serving; the pool is created lazily on the first database request
+        logger.warning(f"PostgreSQL pool not available at startup: {e}")
 
-    # Sanitize filename and project ID for safe storage
-    preferred_filename = sanitize_filename(original_filename)
-    project_id_prefix = sanitize_project_id(project_id)
 
-    # Combine the project prefix and the new folder prefix
-    full_prefix = os.path.join(project_id_prefix, minio_folder_prefix)
+@app.on_event("shutdown")
+async def close_database_pool():
+    """Release all pooled PostgreSQL connections."""
+    await close_pg_pool()
 
-    # Compose initial object name for MinIO
-    desired_object_name = os.path.join(full_prefix, preferred_filename)
-    final_object_name = desired_object_name
 
-    # Handle duplicate object names by appending a counter
-    counter = 0
-    base_name_for_counter, extension_for_counter = os.path.splitext(preferred_filename)
-    while True:
-        try:
-            minio_client.stat_object(MINIO_DEFAULT_BUCKET, final_object_name)
-            counter += 1
-            current_try_filename_with_counter = (
-                f"{base_name_for_counter}({counter}){extension_for_counter}"
-            )
-            final_object_name = os.path.join(
-                full_prefix, current_try_filename_with_counter
-            )
-        except S3Error as stat_exc:
-            if stat_exc.code == "NoSuchKey":
-                break  # Name is available
-            else:
-                raise stat_exc  # Re-raise other S3 errors
+def metadata_text(user_metadata: dict, key: str, default: str | None = None):
+    """
+    Read a free-text metadata field as a string. YAML turns values such as
+    `author: 12345` into ints, which asyncpg will not bind to a text column.
+    """
+    value = user_metadata.get(key, default)
+    return None if value is None else str(value)
 
-    # Upload result to MinIO
-    minio_client.put_object(
-        MINIO_DEFAULT_BUCKET,
-        final_object_name,
-        file_data,
-        length=file_size,
-        part_size=10 * 1024 * 1024,
-        content_type=content_type or "application/octet-stream",
-    )
 
-    file_type_extension = get_file_extension(original_filename)
+def build_upload_context(user_metadata: dict, minio_folder_prefix: str = "") -> dict:
+    """
+    Helper function to derive everything an upload shares across its files:
+    the user metadata fields, the parsed conduct date and the MinIO object prefix.
+    Computed once per request, so folder uploads do not repeat it for every file.
+    """
+    # Fetch metadata from dictionary
+    project_id = metadata_text(user_metadata, "project_id", "")
+    date_conducted_str = user_metadata.get("date_conducted")
+
     date_conducted = None
     if date_conducted_str:
         try:
-            date_conducted = datetime.datetime.strptime(
-                str(date_conducted_str), "%Y-%m-%d"
-            ).date()
+            date_text = str(date_conducted_str)
+            # fromisoformat is the fast path for zero-padded dates only; it also
+            # takes forms such as '20240105' that strptime rejects, while
+            # strptime also takes unpadded dates such as '2024-1-5'
+            if ISO_DATE_RE.fullmatch(date_text):
+                date_conducted = datetime.date.fromisoformat(date_text)
+            else:
+                date_conducted = datetime.datetime.strptime(
+                    date_text, "%Y-%m-%d"
+                ).date()
         except (ValueError, TypeError):
             logger.warning(
                 f"Invalid date format: '{date_conducted_str}'. Storing as null."
             )
 
-    ingestion_time = datetime.datetime.now(datetime.timezone.utc)
+    # Sanitize project ID for safe storage and combine it with the folder prefix
+    object_prefix = os.path.join(sanitize_project_id(project_id), minio_folder_prefix)
+
+    return {
+        "project_id": project_id,
+        "author": metadata_text(user_metadata, "author"),
+        "experiment_type": metadata_text(user_metadata, "experiment_type"),
+        "date_conducted": date_conducted,
+        "custom_tags": metadata_text(user_metadata, "custom_tags"),
+        "object_prefix": object_prefix,
+    }
+
+
+async def upload_file_to_minio(
+    file_data,
+    original_filename: str,
+    content_type: str,
+    file_size: int,
+    upload_context: dict,
+) -> dict:
+    """
+    Helper function to process a single file and upload it to MinIO.
+    Returns the file's metadata as keyword arguments for store_file_metadata_in_db,
+    so callers can store it individually or as part of a batch.
+    """
+    # Sanitize filename for safe storage
+    preferred_filename = sanitize_filename(original_filename)
+
+    # Make the object name unique by suffixing part of the file's UUID, so no
+    # existence probe against MinIO is needed before uploading
     new_file_id = uuid.uuid4()
+    base_name, extension = os.path.splitext(preferred_filename)
+    final_object_name = os.path.join(
+        upload_context["object_prefix"], f"{base_name}_{new_file_id.hex[:8]}{extension}"
+    )
 
-    metadata_storage_result = await store_file_metadata_in_db(
-        file_id=new_file_id,
-        original_file_name=original_filename,
-        minio_bucket_name=MINIO_DEFAULT_BUCKET,
-        minio_object_path=final_object_name,
-        file_type_extension=file_type_extension,
-        content_type=content_type or "application/octet-stream",
-        upload_timestamp=ingestion_time,
-        experiment_type=experiment_type,
-        date_conducted=date_conducted,
-        author=author,
-        project_id=project_id,
-        custom_tags=custom_tags,
-        size_bytes=file_size,
+    # Upload result to MinIO in a worker thread so the event loop stays free
+    await asyncio.to_thread(
+        minio_client.put_object,
+        MINIO_DEFAULT_BUCKET,
+        final_object_name,
+        file_data,
+        length=file_size,
+        part_size=MINIO_PART_SIZE,
+        content_type=content_type or DEFAULT_CONTENT_TYPE,
     )
 
+    return {
+        "file_id": new_file_id,
+        "original_file_name": original_filename,
+        "minio_bucket_name": MINIO_DEFAULT_BUCKET,
+        "minio_object_path": final_object_name,
+        "file_type_extension": get_file_extension(original_filename),
+        "content_type": content_type or DEFAULT_CONTENT_TYPE,
+        "experiment_type": upload_context["experiment_type"],
+        "date_conducted": upload_context["date_conducted"],
+        "author": upload_context["author"],
+        "project_id": upload_context["project_id"],
+        "custom_tags": upload_context["custom_tags"],
+        "size_bytes": file_size,
+    }
+
+
+def build_upload_result(file_metadata: dict, metadata_storage_result: dict) -> dict:
+    """Summarize an uploaded file and the outcome of storing its metadata."""
     return {
         "status": metadata_storage_result.get("status"),
-        "original_filename": original_filename,
-        "final_object_name": final_object_name,
-        "file_id": str(new_file_id),
+        "original_filename": file_metadata["original_file_name"],
+        "final_object_name": file_metadata["minio_object_path"],
+        "file_id": str(file_metadata["file_id"]),
         "message": metadata_storage_result.get("message"),
     }
 
 
+def build_upload_failure(original_filename: str, error: Exception) -> dict:
+    """Summarize a file that could not be uploaded to MinIO."""
+    return {
+        "status": "error",
+        "original_filename": original_filename,
+        "final_object_name": None,
+        "file_id": None,
+        "message": f"Failed to upload file to storage: {str(error)}",
+    }
+
+
+async def process_and_store_file(
+    file_data,
+    original_filename: str,
+    content_type: str,
+    file_size: int,
+    user_metadata: dict,
+) -> dict:
+    """
+    Helper function to upload a single file to MinIO and store its metadata.
+    """
+    file_metadata = await upload_file_to_minio(
+        file_data=file_data,
+        original_filename=original_filename,
+        content_type=content_type,
+        file_size=file_size,
+        upload_context=build_upload_context(user_metadata),
+    )
+    metadata_storage_result = await store_file_metadata_in_db(**file_metadata)
+    return build_upload_result(file_metadata, metadata_storage_result)
+
+
 @app.get("/status")
 async def read_root():
     """Root endpoint for health check or welcome message."""
@@ -164,7 +248,7 @@ async def create_upload_file(
 
     try:
         yaml_content = await metadata_file.read()
-        user_metadata = yaml.safe_load(yaml_content)
+        user_metadata = yaml.load(yaml_content, Loader=YamlSafeLoader)
         if not isinstance(user_metadata, dict):
             raise ValueError("YAML content could not be parsed into a dictionary.")
     except Exception as e:
@@ -210,7 +294,7 @@ async def create_upload_folder(
 
     try:
         yaml_content = await metadata_file.read()
-        user_metadata = yaml.safe_load(yaml_content)
+        user_metadata = yaml.load(yaml_content, Loader=YamlSafeLoader)
         if not isinstance(user_metadata, dict):
             raise ValueError("YAML content could not be parsed into a dictionary.")
     except Exception as e:
@@ -228,35 +312,70 @@ async def create_upload_folder(
 
     logger.info(f"Creating MinIO folder prefix: {unique_folder_name}")
 
-    temp_dir = tempfile.mkdtemp()
-    results = []
-
     try:
-        zip_file_path = Path(temp_dir) / zip_file.filename
-        with open(zip_file_path, "wb") as f:
-            shutil.copyfileobj(zip_file.file, f)
-
-        with zipfile.ZipFile(zip_file_path, "r") as zf:
-            zf.extractall(temp_dir)
-
-        # Iterate through all extracted files, including those in subdirectories
-        for filepath in Path(temp_dir).rglob("*"):
-            if (
-                filepath.is_file()
-                and not filepath.name.startswith("__MACOSX")
-                and filepath.suffix != ".zip"
-            ):
-                with open(filepath, "rb") as f:
-                    file_size = filepath.stat().st_size
-                    result = await process_and_store_file(
-                        file_data=f,
-                        original_filename=filepath.name,
-                        content_type=None,
-                        file_size=file_size,
-                        user_metadata=user_metadata,
-                        minio_folder_prefix=unique_folder_name,  # Pass the folder prefix
-                    )
-                    results.append(result)
+        # UploadFile spools to a seekable temporary file, so the archive is read
+        # in place and each member is streamed straight to MinIO without
+        # copying the ZIP or extracting it to disk first
+        with zipfile.ZipFile(zip_file.file, "r") as zf:
+            # Collect all files in the archive, including those in subdirectories
+            members = [
+                zip_info
+                for zip_info in zf.infolist()
+                if not (
+                    zip_info.is_dir()
+                    or zip_info.filename.startswith("__MACOSX")
+                    or Path(zip_info.filename).suffix == ".zip"
+                )
+            ]
+            upload_slots = asyncio.Semaphore(FOLDER_UPLOAD_CONCURRENCY)
+            # Shared by every member, so it is derived once for the whole folder
+            upload_context = build_upload_context(
+                user_metadata, minio_folder_prefix=unique_folder_name
+            )
+
+            async def upload_member(zip_info: zipfile.ZipInfo) -> dict:
+                async with upload_slots:
+                    with zf.open(zip_info) as f:
+                        return await upload_file_to_minio(
+                            file_data=f,
+                            original_filename=Path(zip_info.filename).name,
+                            content_type=None,
+                            file_size=zip_info.file_size,
+                            upload_context=upload_context,
+                        )
+
+            # Upload members concurrently; wait for all of them before the
+            # archive is closed, even if some fail
+            upload_outcomes = await asyncio.gather(
+                *(upload_member(zip_info) for zip_info in members),
+                return_exceptions=True,
+            )
+
+        # A failed member is reported on its own; the others are still cataloged
+        uploaded_files_metadata = []
+        for zip_info, outcome in zip(members, upload_outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(
+                    f"Error uploading {zip_info.filename} from folder upload {zip_file.filename}: {outcome}",
+                    exc_info=outcome,
+                )
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                uploaded_files_metadata.append(outcome)
+
+        # Store metadata for every uploaded file in a single database round trip
+        metadata_storage_result = await store_file_metadata_batch(
+            uploaded_files_metadata
+        )
+        results = [
+            (
+                build_upload_failure(Path(zip_info.filename).name, outcome)
+                if isinstance(outcome, Exception)
+                else build_upload_result(outcome, metadata_storage_result)
+            )
+            for zip_info, outcome in zip(members, upload_outcomes)
+        ]
 
         return JSONResponse(status_code=200, content={"upload_results": results})
 
@@ -273,7 +392,6 @@ async def create_upload_folder(
         )
     finally:
         await zip_file.close()
-        shutil.rmtree(temp_dir)  # Clean up the temporary directory
 
 
 @app.get("/search")
@@ -294,7 +412,7 @@ async def search_files_endpoint(
         None, description="Filter by experiment type (case-insensitive, partial match)."
     ),
     tags_contain: str | None = Query(
-        None, description="Search for a keyword within the custom_tags field."
+        None, description="Search for whole keywords within the custom_tags field."
     ),
     date_after: datetime.date | None = Query(
         None,
@@ -347,14 +465,16 @@ async def download_file_by_stream(file_id: uuid.UUID):
         bucket_name = minio_details.get("bucket")
         object_path = minio_details.get("path")
         original_filename = minio_details.get("filename")
-        content_type = minio_details.get("content_type") or "application/octet-stream"
+        content_type = minio_details.get("content_type") or DEFAULT_CONTENT_TYPE
 
         logger.info(
             f"Proxying download for '{object_path}' from bucket '{bucket_name}'..."
         )
 
         # Use get_object for streaming
-        response_stream = minio_client.get_object(bucket_name, object_path)
+        response_stream = await asyncio.to_thread(
+            minio_client.get_object, bucket_name, object_path
+        )
 
         def close_stream():
             logger.info(f"Closing MinIO response stream for {object_path}")
@@ -362,7 +482,9 @@ async def download_file_by_stream(file_id: uuid.UUID):
             response_stream.release_conn()
 
         return StreamingResponse(
-            content=response_stream.stream(amt=65536),
+            # Starlette iterates this sync generator in its threadpool, so the
+            # socket reads from MinIO do not block the event loop
+            content=response_stream.stream(amt=DOWNLOAD_CHUNK_SIZE),
             media_type=content_type,
             headers={
                 "Content-Disposition": f'attachment; filename="{original_filename}"'
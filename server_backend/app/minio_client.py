@@ -1,9 +1,51 @@
 import logging
+import os
 
+import certifi
+import urllib3
 from minio import Minio
+from minio.error import S3Error
 
 logger = logging.getLogger(__name__)
 
+# Set once the default bucket has been verified, so the check runs once per process
+_default_bucket_checked = False
+
+
+def _build_http_client() -> urllib3.PoolManager:
+    """
+    Build the shared HTTP connection pool used for all MinIO requests.
+    Mirrors the MinIO SDK defaults, with a larger pool for concurrent uploads.
+    """
+    timeout = 5 * 60  # seconds, same as the MinIO SDK default
+    return urllib3.PoolManager(
+        num_pools=10,
+        maxsize=32,
+        timeout=urllib3.Timeout(connect=timeout, read=timeout),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        retries=urllib3.Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+        ),
+    )
+
+
+def _check_bucket_exists(client: Minio, bucket: str) -> bool:
+    """
+    Fall back to a read-only existence check for the default bucket.
+    Returns True if the bucket is known to exist.
+    """
+    try:
+        if client.bucket_exists(bucket):
+            logger.info(f"Bucket '{bucket}' already exists in MinIO.")
+            return True
+        logger.error(
+            f"MinIO bucket '{bucket}' does not exist and these credentials cannot create it."
+        )
+    except Exception as e:
+        logger.warning(f"Could not verify MinIO bucket '{bucket}': {e}")
+    return False
+
 
 def get_minio_client(
     endpoint: str, username: str, password: str, default_bucket: str, secure: bool
@@ -11,6 +53,7 @@ def get_minio_client(
     """
     Initialize and return a MinIO client instance.
     """
+    global _default_bucket_checked
 
     logger.info(f"MinIO Client Secure Flag is: {str(secure)} (Type: {secure})")
 
@@ -25,6 +68,7 @@ def get_minio_client(
                 username,
                 password,
                 secure=secure,
+                http_client=_build_http_client(),
             )
         except Exception as e:
             logger.error(f"Minio client initialization failed: {e}", exc_info=True)
@@ -32,10 +76,31 @@ def get_minio_client(
         logger.warning(
             "MinIO credentials not properly set in environment. MinIO client NOT initialized."
         )
-    # Ensure the default bucket exists
-    if not client.bucket_exists(default_bucket):
-        client.make_bucket(default_bucket)
-        logger.info(f"Bucket '{default_bucket}' created in MinIO.")
-    else:
-        logger.info(f"Bucket '{default_bucket}' already exists in MinIO.")
+    if client is None:
+        return None
+
+    # Ensure the default bucket exists with a single create call instead of
+    # an exists check followed by a create; a transient MinIO outage must not
+    # crash startup
+    if not _default_bucket_checked:
+        try:
+            client.make_bucket(default_bucket)
+            logger.info(f"Bucket '{default_bucket}' created in MinIO.")
+            _default_bucket_checked = True
+        except S3Error as e:
+            if e.code == "BucketAlreadyOwnedByYou":
+                logger.info(f"Bucket '{default_bucket}' already exists in MinIO.")
+                _default_bucket_checked = True
+            elif e.code == "AccessDenied":
+                # Keys without s3:CreateBucket can still use an existing bucket
+                _default_bucket_checked = _check_bucket_exists(client, default_bucket)
+            else:
+                logger.error(
+                    f"Could not create MinIO bucket '{default_bucket}': {e}",
+                    exc_info=True,
+                )
+        except Exception as e:
+            logger.error(
+                f"Could not verify MinIO bucket '{default_bucket}': {e}", exc_info=True
+            )
     return client
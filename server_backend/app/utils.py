@@ -1,51 +1,146 @@
-import datetime
-import os
+import re
+import sys
+import time
+from functools import lru_cache
 
+# Punctuation kept by the sanitizers in addition to alphanumeric characters
+_ALLOWED_PUNCTUATION = frozenset("-_")
 
-def get_file_extension(filename):
+# Matches exactly the characters the sanitizers replace: \w is str.isalnum()
+# plus '_', so this is "not alphanumeric, '-' or '_'" for all of Unicode
+_UNSAFE_CHARS_RE = re.compile(r"[^\w-]")
+
+# bytes.translate table applying the same rule to ASCII input as one C-level
+# pass over a 256-entry lookup table (non-ASCII bytes never reach it)
+_BYTES_TABLE = bytes(
+    byte if chr(byte).isalnum() or chr(byte) in _ALLOWED_PUNCTUATION else 0x5F
+    for byte in range(128)
+) + (b"_" * 128)
+
+# Names that sanitizing would return unchanged, so the rewrite can be skipped
+_CLEAN_FILENAME_RE = re.compile(r"[A-Za-z0-9_-]+(?:\.[A-Za-z0-9]+)?")
+_CLEAN_PROJECT_ID_RE = re.compile(r"[A-Za-z0-9-](?:[A-Za-z0-9_-]*[A-Za-z0-9-])?")
+
+# Longest input memoized by the caches below. Names come from unauthenticated
+# uploads (ZIP member names can be 64 KiB), so longer input is handled uncached
+# and cannot pin large strings in memory for the life of the process.
+_MAX_CACHED_NAME_LENGTH = 255
+
+
+def _sanitize_bytes(raw):
+    # Replace every byte that is not ASCII alphanumeric, '-' or '_' with '_'
+    return raw.translate(_BYTES_TABLE)
+
+
+def _sanitize_chars(text):
+    """
+    Replace every character that is not alphanumeric, '-' or '_' with '_'.
+    ASCII text (nearly every real name) takes the bytes-level path; other text
+    keeps non-ASCII letters and digits via _UNSAFE_CHARS_RE.
+    """
+    if text.isascii():
+        return _sanitize_bytes(text.encode("ascii")).decode("ascii")
+    return _UNSAFE_CHARS_RE.sub("_", text)
+
+
+def _split_extension(filename):
+    """
+    Split a filename into its base name and extension (without the dot) with a
+    single rpartition, following os.path.splitext: the extension is None if the
+    name has none, and leading dots (e.g. '.bashrc') do not start an extension.
+    """
+    base_name, dot, extension = filename.rpartition(".")
+    if dot and "/" not in extension and base_name.rpartition("/")[2].lstrip("."):
+        return base_name, extension
+    return filename, None
+
+
+def _file_extension(filename):
     # Split the filename to get the extension
-    _, extension = os.path.splitext(filename)
-    if extension:
-        # Remove the leading dot and convert to uppercase
-        return extension.lstrip(".").upper()
+    _, extension = _split_extension(filename)
+    if extension is not None:
+        # Convert to uppercase
+        return extension.upper()
     return "UNKNOWN"  # Return UNKNOWN if no extension is found
 
 
-def sanitize_filename(filename):
+_cached_file_extension = lru_cache(maxsize=8192)(_file_extension)
+
+
+def get_file_extension(filename):
+    if len(filename) <= _MAX_CACHED_NAME_LENGTH:
+        return _cached_file_extension(filename)
+    return _file_extension(filename)
+
+
+def _sanitize_filename_parts(filename):
+    """
+    Memoizable part of sanitize_filename: returns the sanitized base name (empty
+    if nothing is left) and the sanitized extension including its dot.
+    """
     # Split the filename into base name and extension
-    base_name, extension_original = os.path.splitext(filename)
+    base_name, extension = _split_extension(filename)
     # Replace any non-alphanumeric or non-allowed characters with underscore
-    sane_base_name = "".join(
-        c if c.isalnum() or c in ("-", "_") else "_" for c in base_name
-    )
-    if not sane_base_name:
-        # If base name is empty, generate a name using current UTC timestamp
-        # NOTE: Unsure if 'datetime.datetime.utc()' is correct; should be 'datetime.datetime.utcnow()'
-        sane_base_name = f"upload_{datetime.datetime.utc().strftime('%Y%m%d%H%M%S%f')}"
+    sane_base_name = _sanitize_chars(base_name)
 
     sanitized_extension = ""
-    if extension_original:
-        # Sanitize the extension: keep only alphanumeric characters if extension starts with '.'
-        sanitized_extension = "." + "".join(
-            c
-            for c in extension_original.lstrip(".")
-            if c.isalnum() and extension_original.startswith(".")
+    if extension is not None:
+        # Sanitize the extension: keep only alphanumeric characters. Typical
+        # extensions already are, so the join only runs when something must go.
+        if extension.isalnum():
+            extension_tail = extension
+        else:
+            extension_tail = "".join(filter(str.isalnum, extension))
+        # If nothing left after sanitization, drop the dot as well
+        sanitized_extension = "." + extension_tail if extension_tail else ""
+    return sane_base_name, sanitized_extension
+
+
+_cached_sanitize_filename_parts = lru_cache(maxsize=8192)(_sanitize_filename_parts)
+
+
+def sanitize_filename(filename):
+    # Fast path: most filenames are already safe
+    if _CLEAN_FILENAME_RE.fullmatch(filename):
+        return filename
+    if len(filename) <= _MAX_CACHED_NAME_LENGTH:
+        sane_base_name, sanitized_extension = _cached_sanitize_filename_parts(filename)
+    else:
+        sane_base_name, sanitized_extension = _sanitize_filename_parts(filename)
+    if not sane_base_name:
+        # If base name is empty, generate a name using current UTC timestamp
+        # (YYYYmmddHHMMSS plus microseconds) straight from the integer clock.
+        # Kept outside the cache, since it must be fresh on every call.
+        now_ns = time.time_ns()
+        sane_base_name = "upload_%s%06d" % (
+            time.strftime("%Y%m%d%H%M%S", time.gmtime(now_ns // 1_000_000_000)),
+            (now_ns // 1000) % 1_000_000,
         )
-        if sanitized_extension == ".":
-            # If nothing left after sanitization, remove the dot
-            sanitized_extension = ""
     # Return the sanitized filename
     return f"{sane_base_name}{sanitized_extension}"
 
 
-def sanitize_project_id(project_id):
+def _sanitize_project_id(project_id):
     sane_prefix = ""
     if project_id:
-        # Replace any non-alphanumeric or non-allowed characters with underscore
-        sane_project_id = "".join(
-            c if c.isalnum() or c in ("-", "_") else "_" for c in project_id.strip()
-        ).strip("_")
+        # Fast path: most project IDs are already safe
+        if _CLEAN_PROJECT_ID_RE.fullmatch(project_id):
+            return sys.intern(f"{project_id}/")
+        # Replace any non-alphanumeric or non-allowed characters with underscore.
+        # Surrounding whitespace becomes '_' too, so one strip("_") trims both.
+        sane_project_id = _sanitize_chars(project_id).strip("_")
         if sane_project_id:
-            # Add a trailing slash if the project_id is not empty after sanitization
-            sane_prefix = f"{sane_project_id}/"
+            # Add a trailing slash if the project_id is not empty after sanitization.
+            # Interned: the same few prefixes are reused for every object key.
+            sane_prefix = sys.intern(f"{sane_project_id}/")
     return sane_prefix
+
+
+# Sized for the handful of distinct projects a deployment actually uses
+_cached_sanitize_project_id = lru_cache(maxsize=256)(_sanitize_project_id)
+
+
+def sanitize_project_id(project_id):
+    if project_id and len(project_id) > _MAX_CACHED_NAME_LENGTH:
+        return _sanitize_project_id(project_id)
+    return _cached_sanitize_project_id(project_id)
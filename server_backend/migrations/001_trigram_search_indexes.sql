@@ -0,0 +1,20 @@
+-- Trigram indexes for the ILIKE '%term%' filters used by search_files_in_db.
+-- A leading wildcard cannot use a B-tree index; pg_trgm GIN indexes let the
+-- planner answer these substring matches without a sequential scan.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS files_metadata_catalog_project_id_trgm
+    ON file_index.files_metadata_catalog USING GIN (project_id gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS files_metadata_catalog_author_trgm
+    ON file_index.files_metadata_catalog USING GIN (author gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS files_metadata_catalog_file_type_trgm
+    ON file_index.files_metadata_catalog USING GIN (file_type gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS files_metadata_catalog_experiment_type_trgm
+    ON file_index.files_metadata_catalog USING GIN (experiment_type gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS files_metadata_catalog_custom_tags_trgm
+    ON file_index.files_metadata_catalog USING GIN (custom_tags gin_trgm_ops);
@@ -0,0 +1,15 @@
+-- Full-text search over custom_tags. The comma-separated tags are tokenized
+-- into a stored tsvector with the 'simple' configuration (no stemming or stop
+-- words) and indexed with GIN, so tag searches become inverted-index lookups.
+
+ALTER TABLE file_index.files_metadata_catalog
+    ADD COLUMN IF NOT EXISTS custom_tags_tsv tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', replace(coalesce(custom_tags, ''), ',', ' '))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS files_metadata_catalog_custom_tags_tsv
+    ON file_index.files_metadata_catalog USING GIN (custom_tags_tsv);
+
+-- Tag searches no longer use ILIKE, so the trigram index from 001 is unused.
+DROP INDEX IF EXISTS file_index.files_metadata_catalog_custom_tags_trgm;
@@ -0,0 +1,12 @@
+-- Store file_id as a native uuid and index it for the per-download lookup in
+-- get_file_minio_details; index upload_timestamp for the
+-- "ORDER BY upload_timestamp DESC LIMIT 100" in search_files_in_db.
+
+ALTER TABLE file_index.files_metadata_catalog
+    ALTER COLUMN file_id TYPE uuid USING file_id::uuid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS files_metadata_catalog_file_id
+    ON file_index.files_metadata_catalog (file_id);
+
+CREATE INDEX IF NOT EXISTS files_metadata_catalog_upload_timestamp
+    ON file_index.files_metadata_catalog (upload_timestamp DESC);